@@ -1,31 +1,61 @@
 #!/usr/bin/env python3
 import argparse
 import datetime
+import functools
 import inspect
 import json
 import logging
+import os
 import random
+import re
+import time
+import typing
 
-import dateutil.parser
-import giphy_client
+import requests
 import sqlalchemy
-import sqlalchemy.exc
-import tabulate
 import telegram
+from requests.adapters import HTTPAdapter
 from mensaparser import get_food_plan
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import scoped_session, sessionmaker, relationship
+from sqlalchemy.pool import QueuePool
 from telegram import Update
 from telegram.error import TelegramError
 from telegram.ext import Updater, CommandHandler, CallbackContext, Filters, MessageHandler
 
 Base = declarative_base()
 
-# Enable logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO)
+# Catch-all fallback filter for the giphy handler; precompiled once instead
+# of rebuilding a regex union on every incoming update.
+_ANY_MSG = Filters.regex(re.compile(r'.*', re.DOTALL))
+
+# How long a group-membership lookup may be reused before asking Telegram
+# again.
+_MEMBER_CACHE_TTL = 60
+
+# How long a rendered schedule may be served from cache; write handlers
+# invalidate it immediately anyway, the TTL only bounds cross-thread
+# staleness.
+_SCHEDULE_CACHE_TTL = 10
+
+# Markdown link to a participant; bound once so the template is only parsed
+# a single time instead of per rendered ticket.
+_LINK_TMPL = "[{fullname}](tg://user?id={tid})".format_map
+
+
+class ParsedArgs(typing.NamedTuple):
+    date: datetime.datetime
+    station: str
+
+
+# Shared error results for parse_args; on the failure path date is None and
+# the second slot carries the message, without allocating a fresh tuple and
+# string per rejected command.
+_ERR_NOT_ENOUGH = ParsedArgs(None, "Not enough arguments. Please provide time and station name.")
+_ERR_BAD_FORMAT = ParsedArgs(None, "Invalid date format")
+_ERR_OUT_OF_HOURS = ParsedArgs(None, "Schedule planning only possible from 11:00 until 15:30")
 
 logger = logging.getLogger(__name__)
 
@@ -40,10 +70,19 @@ class ScheduleMap(Base):
     date = sqlalchemy.Column(sqlalchemy.DateTime)
     station = sqlalchemy.Column(sqlalchemy.String(50))
     tickets = relationship("TicketMap", back_populates="journey")
+    # Consumers almost always want only unrevoked tickets; this filtered
+    # collection pushes the valid predicate into the eager-load SQL.
+    active_tickets = relationship(
+        "TicketMap",
+        primaryjoin="and_(ScheduleMap.id == TicketMap.sid, TicketMap.valid == True)",
+        viewonly=True, lazy='selectin')
     owner = sqlalchemy.Column(sqlalchemy.Integer,
                               sqlalchemy.ForeignKey("users.id"))
     valid = sqlalchemy.Column(sqlalchemy.Boolean, default=True)
-    __table_args__ = (sqlalchemy.UniqueConstraint(date, station),)
+    __table_args__ = (
+        sqlalchemy.UniqueConstraint(date, station),
+        sqlalchemy.Index('ix_schedule_date_valid', date, valid),
+    )
 
 
 class TicketMap(Base):
@@ -52,32 +91,92 @@ class TicketMap(Base):
         sqlalchemy.Integer, primary_key=True, autoincrement=True)
     sid = sqlalchemy.Column(sqlalchemy.Integer,
                             sqlalchemy.ForeignKey('schedule.id'))
-    journey = relationship("ScheduleMap", back_populates="tickets")
+    # Many-to-one sides are always dereferenced right after loading a
+    # ticket (schedule rendering, revoke confirmation), so fetch them in
+    # the same query. The collection sides stay selectin/lazy.
+    journey = relationship("ScheduleMap", back_populates="tickets", lazy='joined')
     uid = sqlalchemy.Column(sqlalchemy.Integer,
                             sqlalchemy.ForeignKey("users.id"))
-    user = relationship("UserMap", back_populates="tickets")
+    user = relationship("UserMap", back_populates="tickets", lazy='joined')
     valid = sqlalchemy.Column(sqlalchemy.Boolean, default=True)
+    __table_args__ = (
+        sqlalchemy.Index('uq_tickets_sid_uid', sid, uid, unique=True),
+        sqlalchemy.Index('ix_tickets_sid_valid', sid, valid),
+        sqlalchemy.Index('ix_tickets_uid_valid', uid, valid),
+    )
 
 
 class UserMap(Base):
     __tablename__ = 'users'
     id = sqlalchemy.Column(
         sqlalchemy.Integer, primary_key=True, autoincrement=True)
-    tid = sqlalchemy.Column(sqlalchemy.String(32))
+    # Telegram user ids are 64-bit integers; storing them as such keeps the
+    # unique index compact and lookups a native integer probe.
+    tid = sqlalchemy.Column(sqlalchemy.BigInteger, nullable=False)
     username = sqlalchemy.Column(sqlalchemy.String(32))
     fullname = sqlalchemy.Column(sqlalchemy.String(50))
     tickets = relationship("TicketMap", back_populates="user")
+    active_tickets = relationship(
+        "TicketMap",
+        primaryjoin="and_(UserMap.id == TicketMap.uid, TicketMap.valid == True)",
+        viewonly=True)
+    __table_args__ = (
+        sqlalchemy.Index('ix_users_tid', tid, unique=True),
+    )
+
+
+# Hot-path statements built once at import so handlers skip the ORM
+# statement-construction step and hit SQLAlchemy's compiled cache directly.
+_STMT_USER_BY_TID = select(UserMap).where(UserMap.tid == bindparam('tid'))
+# The UserMap join needs an explicit onclause: left to its own devices
+# SQLAlchemy resolves it via ScheduleMap.owner, i.e. journey ownership
+# instead of ticket holding.
+_STMT_USER_TICKET = (
+    select(TicketMap).join(ScheduleMap).join(
+        UserMap, TicketMap.uid == UserMap.id).where(
+        UserMap.tid == bindparam('tid'),
+        TicketMap.valid.is_(True),
+        ScheduleMap.date >= bindparam('lo'),
+        ScheduleMap.date < bindparam('hi')))
+_STMT_TRAINS_TODAY = (
+    select(ScheduleMap).where(
+        ScheduleMap.date >= bindparam('lo'),
+        ScheduleMap.date < bindparam('hi'),
+        ScheduleMap.valid.is_(True)).order_by(ScheduleMap.date))
+# Answers both /ticket prechecks in one round-trip: does the user already
+# hold a ticket today, and does the requested journey exist. Same explicit
+# onclause as above, for the same reason.
+_STMT_TICKET_PRECHECK = select(
+    select(TicketMap.id).join(ScheduleMap).join(
+        UserMap, TicketMap.uid == UserMap.id).where(
+        UserMap.tid == bindparam('tid'),
+        TicketMap.valid.is_(True),
+        ScheduleMap.date >= bindparam('lo'),
+        ScheduleMap.date < bindparam('hi')).limit(1).scalar_subquery(),
+    select(ScheduleMap.id).where(
+        ScheduleMap.date == bindparam('date'),
+        ScheduleMap.station == bindparam('station')).scalar_subquery())
 
 
 def access_restricted(func):
     def access_wrapper(self, update: Update, context: CallbackContext):
         try:
             if self.group_restriction:
-                user = context.bot.get_chat_member(
-                    self.group_restriction,
-                    update.effective_user.id
-                )
-                if user.status in ("member", "admin", "creator"):
+                key = (self.group_restriction, update.effective_user.id)
+                now = time.monotonic()
+                cached = self._member_cache.get(key)
+                if cached is not None and cached[1] > now:
+                    status = cached[0]
+                else:
+                    user = context.bot.get_chat_member(
+                        self.group_restriction,
+                        update.effective_user.id
+                    )
+                    status = user.status
+                    if len(self._member_cache) > 1024:
+                        self._member_cache.clear()
+                    self._member_cache[key] = (status, now + _MEMBER_CACHE_TTL)
+                if status in ("member", "admin", "creator"):
                     return func(self, update, context)
                 else:
                     update.message.reply_text("You have not the correct permissions to use this functionality.")
@@ -91,19 +190,104 @@ def access_restricted(func):
     return access_wrapper
 
 
+def _format_schedule(rows, headers):
+    # Plain fixed-width table for the handful of schedule columns; cheaper
+    # than dragging tabulate through its format registry on every /schedule.
+    widths = [max(len(str(r[c])) for r in rows + [headers])
+              for c in range(len(headers))]
+    return "\n".join(
+        "  ".join(str(r[c]).ljust(widths[c])
+                  for c in range(len(headers))).rstrip()
+        for r in [headers] + rows)
+
+
+@functools.lru_cache(maxsize=64)
+def _keyboard_json(items):
+    keyboard = [[item] for item in items]
+    reply_markup = {"keyboard": keyboard, "one_time_keyboard": True}
+    return json.dumps(reply_markup)
+
+
+@functools.lru_cache(maxsize=64)
+def _schedule_keyboard(rows):
+    # The schedule only changes a few times a day, so identical keyboards
+    # are served from cache instead of being rebuilt per /ticket.
+    custom_keyboard = [["/ticket " + time + " " + station]
+                       for time, station in rows]
+    return telegram.ReplyKeyboardMarkup(
+        custom_keyboard, one_time_keyboard=True, selective=True)
+
+
+def session_scope(func):
+    def session_wrapper(self, update: Update, context: CallbackContext):
+        try:
+            return func(self, update, context)
+        finally:
+            self.session.remove()
+
+    return session_wrapper
+
+
 class MensaTrainBot(object):
     def __init__(self, db_file, giphy_api_key, group_restriction):
         # Init DB stuff (sqlite)
-        engine = sqlalchemy.create_engine(f'sqlite:///{db_file}', poolclass=NullPool)
+        # Keep connections alive across handler invocations instead of
+        # reopening the database file on every command; a QueuePool lets
+        # concurrent handler threads check out their own connection. The
+        # pysqlite dialect defaults to NullPool for file databases, so the
+        # pool class has to be requested explicitly.
+        engine = sqlalchemy.create_engine(
+            f'sqlite:///{db_file}',
+            poolclass=QueuePool,
+            pool_size=16,
+            max_overflow=8,
+            connect_args={"check_same_thread": False})
+
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-20000")
+            cursor.execute("PRAGMA mmap_size=134217728")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute("PRAGMA busy_timeout=5000")
+            cursor.close()
+
         Base.metadata.create_all(engine, checkfirst=True)
-        self.session = sessionmaker(bind=engine)
+        # create_all skips tables that already exist, so indexes declared
+        # after a database's first start have to be created explicitly; the
+        # checkfirst makes this a no-op on up-to-date databases.
+        for table in Base.metadata.tables.values():
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+        self.session = scoped_session(sessionmaker(bind=engine))
 
         # Init Giphy API Variables
-        self.giphy_api_instance = giphy_client.DefaultApi()
+        self._giphy_api = None
         self.giphy_api_key = giphy_api_key
+        # Pooled keep-alive session for the hot Giphy search endpoint, so
+        # only the first call pays the TCP+TLS handshake.
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
         # Store group restriction:
         self.group_restriction = group_restriction
+        # (group_id, user_id) -> (status, expiry); avoids one Telegram API
+        # round-trip per command for recently seen users.
+        self._member_cache = {}
+        # (expiry, rows) of the last rendered schedule, or None.
+        self._sched_cache = None
+
+    @property
+    def giphy_api_instance(self):
+        # giphy_client is only needed for /wat; importing it lazily keeps
+        # its module graph off the bot's cold-start path.
+        if self._giphy_api is None:
+            import giphy_client
+            self._giphy_api = giphy_client.DefaultApi()
+        return self._giphy_api
 
     def help(self, update: Update, context: CallbackContext):
         """Send a message when the command /help is issued."""
@@ -121,176 +305,230 @@ class MensaTrainBot(object):
 
     def parse_args(self, args):
         if args is None or len(args) < 2:
-            return None, "Not enough arguments. Please provide time and station name."
-        try:
-            date = dateutil.parser.parse(str(args[0]))
-        except ValueError or OverflowError:
-            return None, "Invalid date format"
-
-        if not datetime.date.today() == date.date():
-            return None, "Schedule planning is only supported for the same day"
+            return _ERR_NOT_ENOUGH
+        # Only same-day times are accepted, so a few fixed-format strptime
+        # attempts beat the generic dateutil parser by an order of magnitude.
+        date = None
+        for fmt in ("%H:%M", "%H%M", "%H.%M"):
+            try:
+                date = datetime.datetime.strptime(args[0], fmt)
+                break
+            except (ValueError, OverflowError):
+                continue
+        if date is None:
+            return _ERR_BAD_FORMAT
+        today = datetime.date.today()
+        date = date.replace(year=today.year, month=today.month, day=today.day)
 
         if (date.hour > 15) or (date.hour == 15 and date.minute > 30) or (date.hour < 11):
-            return None, "Schedule planning only possible from 11:00 until 15:30"
+            return _ERR_OUT_OF_HOURS
 
-        return date, args[1]
+        return ParsedArgs(date, args[1])
 
-    def get_user(self, update: Update):
+    def _today_window(self):
+        # Half-open [today, tomorrow) so midnight departures stay included
+        # and the (date, valid) index serves one range scan.
+        today = datetime.date.today()
+        return today, today + datetime.timedelta(days=1)
+
+    def get_user(self, session, update: Update):
         user_id = update.effective_user.id
-        session = self.session()
-        user = session.query(UserMap).filter_by(tid=user_id)
-        if user.count() == 0:
-            session.add(
-                UserMap(
-                    tid=user_id,
-                    username=update.effective_user.username,
-                    fullname=update.effective_user.full_name))
+        user = session.execute(
+            _STMT_USER_BY_TID, {'tid': user_id}).scalars().first()
+        if user is None:
+            user = UserMap(
+                tid=user_id,
+                username=update.effective_user.username,
+                fullname=update.effective_user.full_name)
+            session.add(user)
             session.commit()
-            user = session.query(UserMap).filter_by(tid=user_id)
-        return user.one()
+        return user
 
-    def get_user_journey(self, update: Update):
-        session = self.session()
+    def get_user_journey(self, session, update: Update):
         user_id = update.effective_user.id
         # Check if the user already has a ticket for today
+        today, tomorrow = self._today_window()
         user_journeys = session.query(UserMap).filter_by(
             tid=user_id).join(TicketMap).join(ScheduleMap).filter(
-            ScheduleMap.date > datetime.date.today(), ScheduleMap.date <
-            datetime.date.today() + datetime.timedelta(1),
-            TicketMap.valid == True)
+            ScheduleMap.date >= today, ScheduleMap.date < tomorrow,
+            TicketMap.valid.is_(True))
         return user_journeys.one_or_none()
 
-    def get_user_ticket(self, update: Update):
-        session = self.session()
-        user = self.get_user(update)
-        user_ticket = session.query(TicketMap).filter(
-            TicketMap.valid == True,
-            TicketMap.uid == user.id).join(ScheduleMap).filter(
-            ScheduleMap.date > datetime.date.today(),
-            ScheduleMap.date <
-            datetime.date.today() + datetime.timedelta(1))
-        return user_ticket.one_or_none()
+    def get_user_ticket(self, session, update: Update):
+        today, tomorrow = self._today_window()
+        return session.execute(
+            _STMT_USER_TICKET,
+            {'tid': update.effective_user.id,
+             'lo': today, 'hi': tomorrow}).scalars().one_or_none()
+
+    def _book_ticket(self, session, journey_id, user):
+        # Upsert so re-booking a previously revoked ticket revalidates the
+        # existing row instead of failing a flush and rolling back. The
+        # caller owns the commit.
+        session.execute(
+            sqlite_insert(TicketMap).values(
+                sid=journey_id, uid=user.id, valid=True).on_conflict_do_update(
+                index_elements=['sid', 'uid'], set_={'valid': True}))
 
     def build_keyboard(self, items):
-        keyboard = [[item] for item in items]
-        reply_markup = {"keyboard": keyboard, "one_time_keyboard": True}
-        return json.dumps(reply_markup)
+        return _keyboard_json(tuple(items))
 
-    def get_trains_today(self):
-        session = self.session()
+    def get_trains_today(self, session):
+        cached = self._sched_cache
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return cached[1]
         schedule_information = []
-        journeys = session.query(ScheduleMap).filter(ScheduleMap.date > datetime.date.today(),
-                                                     ScheduleMap.date < datetime.date.today() + datetime.timedelta(1),
-                                                     ScheduleMap.valid == True).order_by(ScheduleMap.date)
+        # active_tickets arrive via their selectin default with users joined
+        # in, so rendering the schedule issues no further SQL.
+        today, tomorrow = self._today_window()
+        journeys = session.execute(
+            _STMT_TRAINS_TODAY, {'lo': today, 'hi': tomorrow}).scalars().all()
         for j in journeys:
-            participants = session.query(TicketMap).filter(
-                TicketMap.sid == j.id,
-                TicketMap.valid == True).join(UserMap).all()  # noqa
             schedule_information.append([
-                j.id, f"{j.date.hour:02d}:{j.date.minute:02d}",
-                j.station, ", ".join([
-                    "[" + p.user.fullname + "](tg://user?id=" + p.user.tid +
-                    ")" for p in participants
-                ])
+                j.id, f"{j.date:%H:%M}", j.station,
+                ", ".join(_LINK_TMPL({"fullname": t.user.fullname,
+                                      "tid": t.user.tid})
+                          for t in j.active_tickets)
             ])
+        self._sched_cache = (now + _SCHEDULE_CACHE_TTL, schedule_information)
         return schedule_information
 
     @access_restricted
+    @session_scope
     def schedule(self, update: Update, context: CallbackContext):
         """
         """
-        schedule_information = self.get_trains_today()
+        schedule_information = self.get_trains_today(self.session())
         schedule_information_text = "Trains scheduled today:\n"
         schedule_information_headers = [
             "ID", "Departure", "Station", "Passengers"
         ]
-        schedule_information_text += tabulate.tabulate(
-            schedule_information,
-            schedule_information_headers,
-            tablefmt='plain'
-        )
-        update.message.reply_markdown(f"{schedule_information_text}")
+        schedule_information_text += _format_schedule(
+            schedule_information, schedule_information_headers)
+        update.message.reply_markdown(schedule_information_text)
 
     @access_restricted
+    @session_scope
     def ticket(self, update: Update, context: CallbackContext):
         """
         """
         session = self.session()
-        # user_id = update.effective_user.id
-        # Check if the user already has a ticket for today
-        # user_journey = self.get_user_journey(update)
-        user_ticket = self.get_user_ticket(update)
-        if user_ticket is not None:
-            update.message.reply_text("Error processing your request: Already registered for a train today.")
+        parsed = self.parse_args(context.args)
+        if parsed.date is None:
+            # Check if the user already has a ticket for today
+            if self.get_user_ticket(session, update) is not None:
+                update.message.reply_text("Error processing your request: Already registered for a train today.")
+                return
+            schedule = self.get_trains_today(session)
+            reply_markup = _schedule_keyboard(
+                tuple((t[1], t[2]) for t in schedule))
+            update.message.reply_text("Select an available train.", reply_markup=reply_markup)
             return
 
-        args = self.parse_args(context.args)
-        if args[0] is None:
-            schedule = self.get_trains_today()
-            custom_keyboard = [["/ticket " + t[1] + " " + t[2]]
-                               for t in schedule]
-            reply_markup = telegram.ReplyKeyboardMarkup(custom_keyboard, one_time_keyboard=True, selective=True)
-            update.message.reply_text("Select an available train.", reply_markup=reply_markup)
+        today, tomorrow = self._today_window()
+        ticket_id, journey_id = session.execute(
+            _STMT_TICKET_PRECHECK,
+            {'tid': update.effective_user.id, 'lo': today, 'hi': tomorrow,
+             'date': parsed.date, 'station': parsed.station}).one()
+        if ticket_id is not None:
+            update.message.reply_text("Error processing your request: Already registered for a train today.")
             return
-        journeys = session.query(ScheduleMap).filter_by(date=args[0], station=args[1])
-        if journeys.count() == 0:
+        if journey_id is None:
             update.message.reply_text("Error processing your request: No valid journey found.")
             return
 
-        user = self.get_user(update)
-        journey = journeys.one()
-        session.add(TicketMap(sid=journey.id, uid=user.id))
+        user = self.get_user(session, update)
+        self._book_ticket(session, journey_id, user)
         session.commit()
+        self._sched_cache = None
         update.message.reply_text(
             f"You successfully bought your ticket for the train departing from \
-            {journey.station} at {journey.date.hour:02d}:{journey.date.minute:02d}")
+            {parsed.station} at {parsed.date:%H:%M}")
 
     @access_restricted
+    @session_scope
     def revoke(self, update: Update, context: CallbackContext):
         session = self.session()
-        user_ticket = self.get_user_ticket(update)
+        user_ticket = self.get_user_ticket(session, update)
         if user_ticket is None:
             update.message.reply_text(
                 "Error processing your request: No ticket available to revoke")
             return
-        ticket = session.query(TicketMap).filter_by(id=user_ticket.id).one()
-        ticket.valid = False
+        # The ticket (with its journey joined in) is already loaded; issue
+        # the invalidation as a single UPDATE instead of re-fetching and
+        # flushing the ORM object.
+        session.query(TicketMap).filter_by(id=user_ticket.id).update(
+            {'valid': False}, synchronize_session=False)
+        session.commit()
+        self._sched_cache = None
         update.message.reply_text(
-            f"Successfully revoked your Ticket for the journey at {ticket.journey.date.hour:02d}:{ticket.journey.date.minute:02d} from {ticket.journey.station}."
+            f"Successfully revoked your Ticket for the journey at {user_ticket.journey.date:%H:%M} from {user_ticket.journey.station}."
         )
-        session.commit()
 
         return
 
     @access_restricted
+    @session_scope
     def add_departure(self, update: Update, context: CallbackContext):
         """
         """
-        args = self.parse_args(context.args)
-        if args[0] is None:
-            update.message.reply_text(f"Error processing your request: {args[1]}")
+        parsed = self.parse_args(context.args)
+        if parsed.date is None:
+            update.message.reply_text(f"Error processing your request: {parsed.station}")
             return
-        user = self.get_user(update)
         session = self.session()
-        try:
-            session.add(ScheduleMap(date=args[0], station=args[1], owner=user.id))
-            session.commit()
-            self.ticket(update, context)
-        except sqlalchemy.exc.IntegrityError:
+        user = self.get_user(session, update)
+        result = session.execute(
+            sqlite_insert(ScheduleMap).values(
+                date=parsed.date, station=parsed.station, owner=user.id,
+                valid=True).on_conflict_do_nothing(
+                index_elements=['date', 'station']))
+        if result.rowcount == 0:
+            session.rollback()
             update.message.reply_text("Error processing your request: Duplicate journeys found.")
+            return
+        # The departure itself is kept either way; only the automatic ticket
+        # booking requires that the user holds no ticket for today yet.
+        if self.get_user_ticket(session, update) is not None:
+            session.commit()
+            self._sched_cache = None
+            update.message.reply_text("Error processing your request: Already registered for a train today.")
+            return
+        # Book the owner's ticket in the same transaction so the whole
+        # /add_departure costs a single commit.
+        self._book_ticket(session, result.lastrowid, user)
+        session.commit()
+        self._sched_cache = None
+        update.message.reply_text(
+            f"You successfully bought your ticket for the train departing from \
+            {parsed.station} at {parsed.date:%H:%M}")
 
     def essen(self, update: Update, context: CallbackContext):
         """
         """
+        import tabulate
         essensplan = get_food_plan()
         for linie, angebot in essensplan.items():
             header = f"<b>{linie}:</b>\n"
             table = tabulate.tabulate(
                 angebot,
-                tablefmt='plain'
+                tablefmt='plain',
+                disable_numparse=True
             )
             update.message.reply_html(header + table)
 
+    @functools.lru_cache(maxsize=256)
+    def _giphy_search(self, query, slot):
+        # slot buckets cache entries into 5-minute windows so repeated
+        # queries skip the HTTP round-trip but results still refresh.
+        response = self._http.get(
+            "https://api.giphy.com/v1/gifs/search",
+            params={"api_key": self.giphy_api_key, "q": query, "limit": 100},
+            timeout=3)
+        body = response.json()
+        return body["data"], body["pagination"]["total_count"]
+
     def wat(self, update: Update, context: CallbackContext):
         # Get gif by id
         api_response = self.giphy_api_instance.gifs_gif_id_get(self.giphy_api_key, "3WmWdBzqveXaE")
@@ -300,39 +538,50 @@ class MensaTrainBot(object):
     def benotet(self, update: Update, context: CallbackContext):
         # Query list of gifs
         query = "exam+grades"
-        api_response = self.giphy_api_instance.gifs_search_get(self.giphy_api_key, query, limit=100)
+        data, total_count = self._giphy_search(query, int(time.time() // 300))
         # select random gif from first 100 results (or less, if not more are found) (indexes, thats why -1)
-        random_image_id = random.randint(0, min(api_response.pagination.total_count - 1, 99))
+        random_image_id = random.randint(0, min(total_count - 1, 99))
         # Reply gif content link
-        update.message.reply_document(f"{api_response.data[random_image_id].images.original.url}")
+        update.message.reply_document(data[random_image_id]["images"]["original"]["url"])
 
     def giphy(self, update: Update, context: CallbackContext):
         query = "+".join(update.message.text.lower().lstrip('/').split())
-        api_response = self.giphy_api_instance.gifs_search_get(self.giphy_api_key, query, limit=100)
+        data, total_count = self._giphy_search(query, int(time.time() // 300))
         # select random gif from first 100 results (or less, if not more are found) (indexes, thats why -1)
-        random_image_id = random.randint(0, max(min(api_response.pagination.total_count - 1, 99), 0))
+        random_image_id = random.randint(0, max(min(total_count - 1, 99), 0))
         # Reply gif content link
-        update.message.reply_document(f"{api_response.data[random_image_id].images.original.url}")
+        update.message.reply_document(data[random_image_id]["images"]["original"]["url"])
+
+
+# Built once at import; parse_args only has to run the actual parse.
+_ARGPARSER = argparse.ArgumentParser()
+_ARGPARSER.add_argument(
+    '-t', '--token', help='Telegram bot API token. Keep this sekrit!')
+_ARGPARSER.add_argument(
+    '-g', '--giphy', help='Giphy API token. Keep this also sekrit!')
+_ARGPARSER.add_argument(
+    '-r', '--restricted-group', help='Restrict Bot to Group ID.')
 
 
 def parse_args():
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        '-t', '--token', help='Telegram bot API token. Keep this sekrit!')
-    parser.add_argument(
-        '-g', '--giphy', help='Giphy API token. Keep this also sekrit!')
-    parser.add_argument(
-        '-r', '--restricted-group', help='Restrict Bot to Group ID.')
-    return parser.parse_args()
+    return _ARGPARSER.parse_args()
 
 
 def main():
     """Start the bot."""
+    # Enable logging; WARNING by default so steady-state commands don't pay
+    # for INFO record formatting, override via MENSATRAIN_LOG.
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=os.getenv("MENSATRAIN_LOG", "WARNING"))
+
     # Parse CLI-Arguments
     args = parse_args()
 
-    # Create the EventHandler and pass it your bot's token.
-    updater = Updater(args.token, use_context=True)
+    # Create the EventHandler and pass it your bot's token. Multiple
+    # dispatcher workers keep one slow handler (SQLite or Giphy I/O) from
+    # serializing every other user's command.
+    updater = Updater(args.token, use_context=True, workers=16)
 
     # Get the dispatcher to register handlers
     dp = updater.dispatcher
@@ -340,16 +589,18 @@ def main():
     mybot = MensaTrainBot("fahrplan.db", args.giphy, args.restricted_group)
 
     # on different commands - answer in Telegram
-    dp.add_handler(CommandHandler("add_departure", mybot.add_departure))
-    dp.add_handler(CommandHandler("ticket", mybot.ticket))
-    dp.add_handler(CommandHandler("schedule", mybot.schedule))
-    dp.add_handler(CommandHandler("revoke", mybot.revoke))
-    dp.add_handler(CommandHandler("essen", mybot.essen))
-    dp.add_handler(CommandHandler("help", mybot.help))
-    dp.add_handler(CommandHandler("start", mybot.help))
-    dp.add_handler(CommandHandler("wat", mybot.wat))
-    dp.add_handler(CommandHandler("benotet", mybot.benotet))
-    dp.add_handler(MessageHandler((Filters.regex('(.*)') | Filters.command), mybot.giphy))
+    for command, callback in (
+            ("add_departure", mybot.add_departure),
+            ("ticket", mybot.ticket),
+            ("schedule", mybot.schedule),
+            ("revoke", mybot.revoke),
+            ("essen", mybot.essen),
+            ("help", mybot.help),
+            ("start", mybot.help),
+            ("wat", mybot.wat),
+            ("benotet", mybot.benotet)):
+        dp.add_handler(CommandHandler(command, callback))
+    dp.add_handler(MessageHandler(_ANY_MSG, mybot.giphy))
 
     # on noncommand i.e message - echo the message on Telegram
     # dp.add_handler(MessageHandler(Filters.text, mybot.echo))
@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import mensatrain
+
+
+def make_update(user_id, username):
+    """Minimal stand-in for a telegram Update that records replies."""
+    replies = []
+    user = SimpleNamespace(
+        id=user_id, username=username, full_name=username.title())
+    message = SimpleNamespace(
+        reply_text=lambda text, **kwargs: replies.append(text))
+    update = SimpleNamespace(effective_user=user, message=message)
+    return update, replies
+
+
+def make_context(args):
+    return SimpleNamespace(bot=None, args=args)
+
+
+class TicketDoubleBookingTest(unittest.TestCase):
+    """The /ticket precheck must match tickets held by the requesting user,
+    not journeys owned by them (regression for the implicit UserMap join
+    resolving through schedule.owner)."""
+
+    def setUp(self):
+        self._db = tempfile.NamedTemporaryFile(suffix=".db")
+        self.bot = mensatrain.MensaTrainBot(self._db.name, None, None)
+
+    def tearDown(self):
+        self.bot.session.remove()
+        self._db.close()
+
+    def test_non_owner_cannot_book_twice_same_day(self):
+        owner, _ = make_update(1, "owner")
+        self.bot.add_departure(owner, make_context(["12:00", "castle"]))
+        self.bot.add_departure(owner, make_context(["12:30", "harbour"]))
+
+        passenger, replies = make_update(2, "passenger")
+        self.bot.ticket(passenger, make_context(["12:00", "castle"]))
+        self.assertTrue(replies[-1].startswith(
+            "You successfully bought your ticket"))
+
+        self.bot.ticket(passenger, make_context(["12:30", "harbour"]))
+        self.assertEqual(
+            replies[-1],
+            "Error processing your request: "
+            "Already registered for a train today.")
+
+        session = self.bot.session()
+        valid_tickets = session.query(mensatrain.TicketMap).join(
+            mensatrain.UserMap,
+            mensatrain.TicketMap.uid == mensatrain.UserMap.id).filter(
+            mensatrain.UserMap.tid == 2,
+            mensatrain.TicketMap.valid.is_(True)).count()
+        self.assertEqual(valid_tickets, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()